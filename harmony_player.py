@@ -1,15 +1,16 @@
 import os
 import sys
 import logging
-import configparser
-import json
+import functools
+import re
+import string
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple, Any
-import vlc
-import requests
+import orjson
 from PyQt5.QtCore import (Qt, QUrl, QTimer, QSize, QPoint, QSettings, 
-                         QStandardPaths, QCoreApplication, QByteArray)
-from PyQt5.QtGui import (QIcon, QPixmap, QColor, QFont, QFontDatabase, 
+                         QStandardPaths, QCoreApplication, QByteArray,
+                         QObject, pyqtSignal, QRunnable, QThreadPool)
+from PyQt5.QtGui import (QIcon, QColor, QFont, QFontDatabase, 
                          QPalette, QLinearGradient, QBrush, QPainter, 
                          QRadialGradient, QImage, QKeySequence)
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
@@ -19,7 +20,8 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QMessageBox, QScrollArea, QSpacerItem, QSizePolicy,
                             QGroupBox, QCheckBox, QDoubleSpinBox, QSpinBox,
                             QLineEdit, QProgressBar, QSplitter, QFrame,
-                            QColorDialog, QShortcut, QStyleFactory)
+                            QColorDialog, QShortcut, QStyleFactory,
+                            QGridLayout)
 
 # Configure logging
 logging.basicConfig(
@@ -36,30 +38,34 @@ logger = logging.getLogger(__name__)
 APP_NAME = "Harmony Pro"
 VERSION = "1.1.0"
 SUPPORTED_FORMATS = ('.mp3', '.flac', '.wav', '.ogg', '.m4a', '.aac')
+CROSSFADE_TICK_MS = 20
+CONFIG_FILENAME = 'config.json'
+LEGACY_CONFIG_FILE = Path('harmony_player.ini')
+_HEX_RE = re.compile(r"^#[0-9a-fA-F]{6}$")
 DEFAULT_CONFIG = {
     'audio': {
-        'volume': '70',
-        'crossfade': '0',
+        'volume': 70,
+        'crossfade': 0,
         'eq_preset': 'flat',
-        'replaygain': 'false',
-        'normalization': 'true'
+        'replaygain': False,
+        'normalization': True
     },
     'appearance': {
         'theme': 'dark',
-        'font_size': '12',
+        'font_size': 12,
         'accent_color': '#1db954',
         'custom_theme': '{}',
-        'window_opacity': '100'
+        'window_opacity': 100
     },
     'playback': {
         'repeat': 'none',
-        'shuffle': 'false',
-        'crossfade_duration': '3',
-        'fade_on_pause': 'true'
+        'shuffle': False,
+        'crossfade_duration': 3,
+        'fade_on_pause': True
     },
     'lyrics': {
-        'auto_fetch': 'true',
-        'font_size': '16',
+        'auto_fetch': True,
+        'font_size': 16,
         'alignment': 'center'
     }
 }
@@ -103,9 +109,183 @@ THEMES = {
     }
 }
 
+# Keyboard shortcuts: (key sequence, MusicPlayer method name)
+_HOTKEYS = (
+    ("Space", "play_pause"),
+    ("Media Play", "play_pause"),
+    ("Ctrl+Right", "next_track"),
+    ("Media Next", "next_track"),
+    ("Ctrl+Left", "prev_track"),
+    ("Media Previous", "prev_track"),
+    ("Ctrl+Up", "_vol_up"),
+    ("Ctrl+Down", "_vol_down"),
+    ("Ctrl+M", "toggle_mute"),
+)
+
+def _coerce_config_value(value: Any, default: Any) -> Any:
+    """Convert a config value to the type of its default, or fall back to the default"""
+    if isinstance(default, bool):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            return value.strip().lower() in ('1', 'true', 'yes', 'on')
+        return default
+    if isinstance(default, int):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            try:
+                return int(value)
+            except ValueError:
+                return default
+        return default
+    if isinstance(default, str):
+        return value if isinstance(value, str) else default
+    return value
+
+def _migrate_legacy_config(ini_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Read an old INI config, converting values to native types"""
+    import configparser
+    # Old values may contain '%', so read them literally
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        parser.read(ini_path)
+        config = {}
+        for section in parser.sections():
+            defaults = DEFAULT_CONFIG.get(section, {})
+            config[section] = {
+                key: _coerce_config_value(value, defaults.get(key, value))
+                for key, value in parser.items(section)
+            }
+    except configparser.Error as e:
+        raise ValueError(f"Malformed legacy config {ini_path}: {e}") from e
+    return config
+
+# Main window stylesheet, filled in with theme colors and the accent color
+_QSS_TEMPLATE = string.Template("""
+QMainWindow {
+    background-color: $base;
+}
+QGroupBox {
+    border: 1px solid $button;
+    border-radius: 5px;
+    margin-top: 10px;
+    padding-top: 15px;
+    color: $text;
+}
+QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 10px;
+}
+QTabBar::tab {
+    background: $button;
+    color: $text;
+    padding: 8px;
+    border-top-left-radius: 5px;
+    border-top-right-radius: 5px;
+}
+QTabBar::tab:selected {
+    background: $panel;
+    color: $text;
+    border-bottom: 3px solid $accent;
+}
+QListWidget {
+    background-color: $panel;
+    color: $text;
+    border: 1px solid $button;
+    border-radius: 5px;
+}
+QSlider::groove:horizontal {
+    height: 6px;
+    background: $button;
+    border-radius: 3px;
+}
+QSlider::handle:horizontal {
+    background: $accent;
+    width: 16px;
+    margin: -5px 0;
+    border-radius: 8px;
+}
+QScrollBar:vertical {
+    background: $panel;
+    width: 10px;
+}
+QScrollBar::handle:vertical {
+    background: $button;
+    min-height: 20px;
+}
+""")
+
+@functools.lru_cache(maxsize=256)
+def _qcolor(hex_str: str) -> QColor:
+    """Parse a color string once and reuse the QColor"""
+    return QColor(hex_str)
+
+@functools.lru_cache(maxsize=32)
+def _build_palette(theme_items: Tuple[Tuple[str, str], ...]) -> QPalette:
+    """Build the application palette for a theme, without the accent highlight"""
+    theme = dict(theme_items)
+    # Start from the style's palette so roles we don't set keep their defaults
+    palette = QApplication.style().standardPalette()
+
+    # Base colors
+    palette.setColor(QPalette.Window, _qcolor(theme['base']))
+    palette.setColor(QPalette.WindowText, _qcolor(theme['text']))
+    palette.setColor(QPalette.Base, _qcolor(theme['panel']))
+    palette.setColor(QPalette.AlternateBase, _qcolor(theme['button']))
+    palette.setColor(QPalette.ToolTipBase, _qcolor(theme['text']))
+    palette.setColor(QPalette.ToolTipText, _qcolor(theme['base']))
+    palette.setColor(QPalette.Text, _qcolor(theme['text']))
+    palette.setColor(QPalette.Button, _qcolor(theme['button']))
+    palette.setColor(QPalette.ButtonText, _qcolor(theme['text']))
+    palette.setColor(QPalette.BrightText, _qcolor(theme['highlight']))
+    palette.setColor(QPalette.HighlightedText, _qcolor(theme['text']))
+
+    return palette
+
+@functools.lru_cache(maxsize=32)
+def _stylesheet_template(theme_items: Tuple[Tuple[str, str], ...]) -> string.Template:
+    """Fill in a theme's colors, leaving $accent for the caller"""
+    return string.Template(_QSS_TEMPLATE.safe_substitute(dict(theme_items)))
+
+def _precompute_theme(name: str) -> Tuple[QPalette, string.Template]:
+    """Prepare the palette and stylesheet template for a built-in theme"""
+    theme_items = tuple(THEMES[name].items())
+    return _build_palette(theme_items), _stylesheet_template(theme_items)
+
+# Built-in themes are known up front, so all of them are prepared together
+_PRECOMPUTED: Dict[str, Tuple[QPalette, string.Template]] = {}
+
+def _builtin_theme(name: str) -> Tuple[QPalette, string.Template]:
+    """Palette and template for a built-in theme, falling back to dark"""
+    if not _PRECOMPUTED:
+        # Palettes need the QApplication style, so this waits for the first use
+        _PRECOMPUTED.update((theme, _precompute_theme(theme)) for theme in THEMES)
+    return _PRECOMPUTED.get(name, _PRECOMPUTED['dark'])
+
+def _swatch_rule(name: str, color: str) -> str:
+    """Stylesheet rule for a theme editor color swatch"""
+    return f"QPushButton#swatch_{name} {{ background-color: {color}; border: none; }}"
+
+class AudioEngineSignals(QObject):
+    """Qt signals emitted by the audio engine from VLC callback threads"""
+    media_parsed = pyqtSignal(dict)
+
 class AudioEngine:
     """Advanced audio engine using VLC with additional features"""
+    __slots__ = (
+        'instance', 'player', 'equalizer', 'current_media', 'media_list',
+        'list_player', 'events', 'compressor', 'spatializer',
+        'crossfade_timer', 'crossfade_duration', 'fade_out_player',
+        '_gout', '_gin', '_fade_out_volumes', '_fade_in_volumes', '_step',
+        'signals',
+        '__weakref__'  # PyQt needs weak references to connect bound methods
+    )
+    
     def __init__(self):
+        # libvlc is imported on first use to keep application startup fast
+        import vlc
+        
         # Initialize VLC with advanced parameters
         vlc_args = [
             '--no-xlib', 
@@ -123,6 +303,7 @@ class AudioEngine:
         self.list_player.set_media_player(self.player)
         self.list_player.set_media_list(self.media_list)
         self.events = self.player.event_manager()
+        self.signals = AudioEngineSignals()
         
         # Audio effects
         self.compressor = None
@@ -132,11 +313,12 @@ class AudioEngine:
         # Default equalizer preset
         self.set_eq_preset('flat')
         
-        # Crossfade timer
-        self.crossfade_timer = QTimer()
-        self.crossfade_timer.timeout.connect(self.handle_crossfade)
+        # Crossfade timer, created on first use so it lives on the GUI thread
+        self.crossfade_timer = None
         self.crossfade_duration = 3  # seconds
         self.fade_out_player = None
+        self._step = 0
+        self._build_crossfade_envelope()
         
     def init_audio_effects(self):
         """Initialize audio effects if available"""
@@ -150,10 +332,14 @@ class AudioEngine:
     
     def load_file(self, file_path: str) -> bool:
         """Load a local file with metadata parsing"""
+        import vlc
         try:
             media = self.instance.media_new(file_path)
             
-            # Parse metadata
+            # Parse metadata in the background, results arrive in _on_parsed
+            media.event_manager().event_attach(
+                vlc.EventType.MediaParsedChanged, self._on_parsed, media
+            )
             media.parse_with_options(vlc.MediaParseFlag.network, 5000)
             
             self.player.set_media(media)
@@ -163,6 +349,19 @@ class AudioEngine:
             logger.error(f"Error loading file: {e}")
             return False
     
+    def _on_parsed(self, event, media):
+        """Forward parsed metadata to the UI (called on a VLC thread)"""
+        import vlc
+        if media.get_parsed_status() != vlc.MediaParsedStatus.done:
+            return
+        self.signals.media_parsed.emit({
+            'mrl': media.get_mrl(),
+            'title': media.get_meta(vlc.Meta.Title) or '',
+            'artist': media.get_meta(vlc.Meta.Artist) or '',
+            'album': media.get_meta(vlc.Meta.Album) or '',
+            'duration': media.get_duration()
+        })
+    
     def play(self) -> bool:
         """Start playback with optional crossfade"""
         if self.crossfade_duration > 0 and self.fade_out_player:
@@ -170,20 +369,114 @@ class AudioEngine:
             return True
         return self.player.play() == 0
     
+    def set_crossfade_duration(self, seconds: int):
+        """Set the crossfade length and rebuild the fade envelope"""
+        self.crossfade_duration = seconds
+        self._build_crossfade_envelope()
+    
+    def _build_crossfade_envelope(self):
+        """Precompute equal-power fade-out/fade-in gains (0-1), one per timer tick"""
+        import numpy as np
+        
+        steps = max(1, self.crossfade_duration * 1000 // CROSSFADE_TICK_MS)
+        curve = np.linspace(0, np.pi / 2, steps)
+        self._gout = np.cos(curve)
+        self._gin = np.sin(curve)
+    
     def start_crossfade(self):
         """Begin crossfade between current and next track"""
-        self.crossfade_timer.start(100)  # Update every 100ms
-        self.fade_out_player.audio_set_volume(100)
+        # Scale the gains to the current volume so the fade ends where it started
+        volume = self.fade_out_player.audio_get_volume()
+        if volume < 0:
+            volume = 100
+        self._fade_out_volumes = (self._gout * volume).round().astype(int).tolist()
+        self._fade_in_volumes = (self._gin * volume).round().astype(int).tolist()
+        self._step = 0
+        if self.crossfade_timer is None:
+            self.crossfade_timer = QTimer()
+            self.crossfade_timer.timeout.connect(self.handle_crossfade)
+        self.crossfade_timer.start(CROSSFADE_TICK_MS)
+        self.fade_out_player.audio_set_volume(volume)
         self.player.audio_set_volume(0)
         self.player.play()
     
     def handle_crossfade(self):
         """Handle crossfade progress"""
-        # Implement crossfade logic here
-        pass
+        i = self._step
+        if i >= len(self._fade_in_volumes):
+            self.crossfade_timer.stop()
+            self.fade_out_player.stop()
+            self.fade_out_player = None
+            return
+        
+        self.fade_out_player.audio_set_volume(self._fade_out_volumes[i])
+        self.player.audio_set_volume(self._fade_in_volumes[i])
+        self._step += 1
     
     # ... (rest of AudioEngine methods)
 
+class AudioEngineLoaderSignals(QObject):
+    """Signals emitted by AudioEngineLoader"""
+    ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+class AudioEngineLoader(QRunnable):
+    """Constructs the AudioEngine off the GUI thread, since libvlc is slow to start"""
+    def __init__(self):
+        super().__init__()
+        self.signals = AudioEngineLoaderSignals()
+    
+    def run(self):
+        try:
+            engine = AudioEngine()
+        except Exception as e:
+            logger.error(f"Could not initialize audio engine: {e}")
+            self.signals.failed.emit(str(e))
+            return
+        
+        # Hand the engine's Qt objects over to the GUI thread
+        engine.signals.moveToThread(QCoreApplication.instance().thread())
+        self.signals.ready.emit(engine)
+
+class ThemePreview(QWidget):
+    """Paints a small mock-up of the theme colors being edited"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.colors = {}
+        self.setFixedHeight(100)
+    
+    def set_colors(self, colors: Dict[str, str]):
+        """Show a new set of colors, repainting on the next paint event"""
+        self.colors = colors
+        self.update()
+    
+    def paintEvent(self, event):
+        if not self.colors:
+            return
+        colors = self.colors
+        painter = QPainter(self)
+        
+        # Draw preview
+        painter.fillRect(self.rect(), _qcolor(colors['base']))
+        
+        # Draw "buttons"
+        painter.setBrush(_qcolor(colors['button']))
+        painter.drawRect(20, 20, 100, 30)
+        
+        # Draw "text"
+        painter.setPen(_qcolor(colors['text']))
+        painter.drawText(130, 40, "Sample Text")
+        
+        # Draw "highlight"
+        painter.setBrush(_qcolor(colors['highlight']))
+        painter.drawRect(250, 20, 30, 30)
+        
+        # Draw "panel"
+        painter.setBrush(_qcolor(colors['panel']))
+        painter.drawRect(300, 20, 80, 60)
+        
+        painter.end()
+
 class ThemeEditor(QWidget):
     """Widget for customizing color themes"""
     def __init__(self, parent=None):
@@ -200,14 +493,16 @@ class ThemeEditor(QWidget):
         self.theme_combo.currentTextChanged.connect(self.theme_changed)
         
         # Color pickers
-        color_group = QGroupBox("Theme Colors")
+        self.color_group = QGroupBox("Theme Colors")
         color_layout = QGridLayout()
         
         self.color_pickers = {}
+        self._colors = {}
         row = 0
         for color_name in ['base', 'text', 'highlight', 'button', 'panel']:
             lbl = QLabel(color_name.capitalize())
             btn = QPushButton()
+            btn.setObjectName(f"swatch_{color_name}")
             btn.setFixedSize(60, 30)
             btn.clicked.connect(lambda _, c=color_name: self.pick_color(c))
             self.color_pickers[color_name] = btn
@@ -216,12 +511,11 @@ class ThemeEditor(QWidget):
             color_layout.addWidget(btn, row, 1)
             row += 1
         
-        color_group.setLayout(color_layout)
+        self.color_group.setLayout(color_layout)
         
         # Preview area
         preview_group = QGroupBox("Preview")
-        self.preview = QLabel()
-        self.preview.setFixedHeight(100)
+        self.preview = ThemePreview()
         preview_group.setLayout(QHBoxLayout())
         preview_group.layout().addWidget(self.preview)
         
@@ -236,7 +530,7 @@ class ThemeEditor(QWidget):
         
         layout.addWidget(QLabel("Select Theme:"))
         layout.addWidget(self.theme_combo)
-        layout.addWidget(color_group)
+        layout.addWidget(self.color_group)
         layout.addWidget(preview_group)
         layout.addLayout(btn_layout)
         
@@ -247,46 +541,21 @@ class ThemeEditor(QWidget):
         """Open color picker for a theme color"""
         color = QColorDialog.getColor()
         if color.isValid():
-            self.color_pickers[color_name].setStyleSheet(
-                f"background-color: {color.name()}; border: none;"
-            )
+            self._colors[color_name] = color.name()
+            self.update_swatches()
             self.update_preview()
     
+    def update_swatches(self):
+        """Restyle all color swatches with a single stylesheet write"""
+        self.color_group.setStyleSheet("\n".join(
+            _swatch_rule(name, color) for name, color in self._colors.items()
+        ))
+    
     def update_preview(self):
         """Update the theme preview"""
-        pixmap = QPixmap(400, 100)
-        painter = QPainter(pixmap)
-        
-        # Get current colors
-        colors = {}
-        for name, btn in self.color_pickers.items():
-            style = btn.styleSheet()
-            if 'background-color' in style:
-                colors[name] = style.split(':')[1].split(';')[0].strip()
-            else:
-                colors[name] = '#000000'
-        
-        # Draw preview
-        painter.fillRect(0, 0, 400, 100, QColor(colors['base']))
-        
-        # Draw "buttons"
-        painter.setBrush(QColor(colors['button']))
-        painter.drawRect(20, 20, 100, 30)
-        
-        # Draw "text"
-        painter.setPen(QColor(colors['text']))
-        painter.drawText(130, 40, "Sample Text")
-        
-        # Draw "highlight"
-        painter.setBrush(QColor(colors['highlight']))
-        painter.drawRect(250, 20, 30, 30)
-        
-        # Draw "panel"
-        painter.setBrush(QColor(colors['panel']))
-        painter.drawRect(300, 20, 80, 60)
-        
-        painter.end()
-        self.preview.setPixmap(pixmap)
+        self.preview.set_colors(
+            {name: self._colors.get(name, '#000000') for name in self.color_pickers}
+        )
     
     def theme_changed(self, theme_name):
         """Handle theme selection change"""
@@ -294,22 +563,15 @@ class ThemeEditor(QWidget):
             return
             
         theme = THEMES.get(theme_name, THEMES['dark'])
-        for name, color in theme.items():
-            btn = self.color_pickers.get(name)
-            if btn:
-                btn.setStyleSheet(f"background-color: {color}; border: none;")
-        
+        self._colors.update(
+            (name, color) for name, color in theme.items() if name in self.color_pickers
+        )
+        self.update_swatches()
         self.update_preview()
     
     def save_theme(self):
         """Save the current custom theme"""
-        theme = {}
-        for name, btn in self.color_pickers.items():
-            style = btn.styleSheet()
-            if 'background-color' in style:
-                theme[name] = style.split(':')[1].split(';')[0].strip()
-        
-        self.parent.save_custom_theme(theme)
+        self.parent.save_custom_theme(dict(self._colors))
     
     def reset_theme(self):
         """Reset to default theme"""
@@ -321,9 +583,22 @@ class MusicPlayer(QMainWindow):
         self.setWindowTitle(f"{APP_NAME} {VERSION}")
         self.setGeometry(100, 100, 1200, 800)
         
-        # Initialize components
-        self.audio_engine = AudioEngine()
+        # Initialize components (the audio engine is loaded in the background)
+        self.audio_engine = None
+        self._engine_loader = None
+        self._cfg_path = Path(
+            QStandardPaths.writableLocation(QStandardPaths.AppConfigLocation)
+        ) / CONFIG_FILENAME
         self.config = self.load_config()
+        
+        # Config writes are coalesced and flushed once activity settles
+        self._cfg_dirty = False
+        self._cfg_flush_timer = QTimer(self)
+        self._cfg_flush_timer.setSingleShot(True)
+        self._cfg_flush_timer.setInterval(500)
+        self._cfg_flush_timer.timeout.connect(self._flush_config)
+        QCoreApplication.instance().aboutToQuit.connect(self._flush_config)
+        
         self.current_track = None
         self.current_lyrics = None
         self.current_playlist = []
@@ -335,160 +610,193 @@ class MusicPlayer(QMainWindow):
         self.init_ui()
         self.init_system_tray()
         self.apply_theme(self.config['appearance']['theme'])
-        self.apply_font_size(int(self.config['appearance']['font_size']))
-        self.apply_accent_color(self.config['appearance']['accent_color'])
-        self.setWindowOpacity(int(self.config['appearance']['window_opacity']) / 100)
-        
-        # Load initial state
-        self.set_volume(int(self.config['audio']['volume']))
+        self.apply_font_size(self.config['appearance']['font_size'])
+        self.setWindowOpacity(self.config['appearance']['window_opacity'] / 100)
         
         # Initialize hotkeys
         self.init_hotkeys()
         
+        self.start_audio_engine()
         logger.info("Application initialized")
 
+    def start_audio_engine(self):
+        """Construct the audio engine on a worker thread"""
+        self.statusBar().showMessage("Loading audio engine...")
+        self._engine_loader = AudioEngineLoader()
+        self._engine_loader.signals.ready.connect(self.on_audio_engine_ready)
+        self._engine_loader.signals.failed.connect(self.on_audio_engine_failed)
+        QThreadPool.globalInstance().start(self._engine_loader)
+
+    def on_audio_engine_ready(self, engine: AudioEngine):
+        """Install the audio engine once the worker has built it"""
+        self._engine_loader = None
+        self.audio_engine = engine
+        engine.set_crossfade_duration(self.config['playback']['crossfade_duration'])
+        engine.signals.media_parsed.connect(self.on_media_parsed)
+        
+        # Load initial state
+        self.set_volume(self.config['audio']['volume'])
+        self.statusBar().clearMessage()
+        logger.info("Audio engine ready")
+
+    def on_audio_engine_failed(self, error: str):
+        """Report that playback is unavailable"""
+        self._engine_loader = None
+        self.statusBar().showMessage(f"Audio engine unavailable: {error}")
+
+    def on_media_parsed(self, meta: Dict[str, Any]):
+        """Update track info once VLC has parsed the loaded media"""
+        current = self.audio_engine.current_media
+        if current is None or current.get_mrl() != meta['mrl']:
+            return  # A different track was loaded in the meantime
+        
+        self.current_track = meta
+        if meta['title']:
+            title = f"{meta['artist']} - {meta['title']}" if meta['artist'] else meta['title']
+            self.setWindowTitle(f"{title} | {APP_NAME}")
+
+    def load_config(self) -> Dict[str, Dict[str, Any]]:
+        """Load config from JSON, merged over the defaults"""
+        path = self._cfg_path
+        stored = {}
+        try:
+            if path.exists():
+                stored = orjson.loads(path.read_bytes())
+            elif LEGACY_CONFIG_FILE.exists():
+                # One-shot migration from the old INI format
+                stored = _migrate_legacy_config(LEGACY_CONFIG_FILE)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(orjson.dumps(stored, option=orjson.OPT_INDENT_2))
+                logger.info(f"Migrated {LEGACY_CONFIG_FILE} to {path}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load config, using defaults: {e}")
+        
+        # Ignore anything that isn't shaped like the defaults
+        if not isinstance(stored, dict):
+            stored = {}
+        
+        # Normalize to native types once, so callers never need to cast
+        config = {}
+        for section, defaults in DEFAULT_CONFIG.items():
+            section_values = stored.get(section)
+            if not isinstance(section_values, dict):
+                section_values = {}
+            values = {**defaults, **section_values}
+            config[section] = {
+                key: _coerce_config_value(value, defaults.get(key, value))
+                for key, value in values.items()
+            }
+        
+        # Keep sections we don't know about so saving doesn't drop them
+        for section, values in stored.items():
+            if section not in config and isinstance(values, dict):
+                config[section] = values
+        return config
+
+    def save_config(self):
+        """Write the current config to disk as JSON"""
+        try:
+            self._cfg_path.parent.mkdir(parents=True, exist_ok=True)
+            self._cfg_path.write_bytes(orjson.dumps(self.config, option=orjson.OPT_INDENT_2))
+        except OSError as e:
+            logger.error(f"Error saving config: {e}")
+
+    def _schedule_save(self):
+        """Mark the config dirty and write it out shortly"""
+        self._cfg_dirty = True
+        if not self._cfg_flush_timer.isActive():
+            self._cfg_flush_timer.start()
+
+    def _flush_config(self):
+        """Write the config to disk if it has pending changes"""
+        if self._cfg_dirty:
+            self._cfg_dirty = False
+            self.save_config()
+
     def load_custom_theme(self) -> Dict[str, str]:
-        """Load custom theme from config"""
+        """Load custom theme from config, dropping invalid colors"""
         try:
-            return json.loads(self.config['appearance']['custom_theme'])
-        except:
+            theme = orjson.loads(self.config['appearance']['custom_theme'])
+        except (orjson.JSONDecodeError, KeyError, TypeError):
             return {}
+        if not isinstance(theme, dict):
+            return {}
+        return {
+            k: v for k, v in theme.items()
+            if k in THEMES['dark'] and isinstance(v, str) and _HEX_RE.match(v)
+        }
 
     def save_custom_theme(self, theme: Dict[str, str]):
         """Save custom theme to config"""
         self.custom_theme = theme
-        self.config['appearance']['custom_theme'] = json.dumps(theme)
-        self.save_config()
+        self.config['appearance']['custom_theme'] = orjson.dumps(theme).decode()
+        self._schedule_save()
         self.apply_theme('custom')
 
     def apply_theme(self, theme_name: str) -> None:
         """Apply theme to the application"""
         if theme_name == 'custom':
-            theme = self.custom_theme
+            # Colors missing from the custom theme fall back to the dark theme
+            theme_items = tuple({**THEMES['dark'], **self.custom_theme}.items())
+            self._base_palette = _build_palette(theme_items)
+            self._base_qss_template = _stylesheet_template(theme_items)
         else:
-            theme = THEMES.get(theme_name, THEMES['dark'])
-        
-        palette = QPalette()
-        
-        # Base colors
-        palette.setColor(QPalette.Window, QColor(theme['base']))
-        palette.setColor(QPalette.WindowText, QColor(theme['text']))
-        palette.setColor(QPalette.Base, QColor(theme['panel']))
-        palette.setColor(QPalette.AlternateBase, QColor(theme['button']))
-        palette.setColor(QPalette.ToolTipBase, QColor(theme['text']))
-        palette.setColor(QPalette.ToolTipText, QColor(theme['base']))
-        palette.setColor(QPalette.Text, QColor(theme['text']))
-        palette.setColor(QPalette.Button, QColor(theme['button']))
-        palette.setColor(QPalette.ButtonText, QColor(theme['text']))
-        palette.setColor(QPalette.BrightText, QColor(theme['highlight']))
-        palette.setColor(QPalette.Highlight, QColor(self.config['appearance']['accent_color']))
-        palette.setColor(QPalette.HighlightedText, QColor(theme['text']))
-        
-        QApplication.setPalette(palette)
+            self._base_palette, self._base_qss_template = _builtin_theme(theme_name)
         
-        # Additional styling
-        self.setStyleSheet(f"""
-            QMainWindow {{
-                background-color: {theme['base']};
-            }}
-            QGroupBox {{
-                border: 1px solid {theme['button']};
-                border-radius: 5px;
-                margin-top: 10px;
-                padding-top: 15px;
-                color: {theme['text']};
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 10px;
-            }}
-            QTabBar::tab {{
-                background: {theme['button']};
-                color: {theme['text']};
-                padding: 8px;
-                border-top-left-radius: 5px;
-                border-top-right-radius: 5px;
-            }}
-            QTabBar::tab:selected {{
-                background: {theme['panel']};
-                color: {theme['text']};
-                border-bottom: 3px solid {self.config['appearance']['accent_color']};
-            }}
-            QListWidget {{
-                background-color: {theme['panel']};
-                color: {theme['text']};
-                border: 1px solid {theme['button']};
-                border-radius: 5px;
-            }}
-            QSlider::groove:horizontal {{
-                height: 6px;
-                background: {theme['button']};
-                border-radius: 3px;
-            }}
-            QSlider::handle:horizontal {{
-                background: {self.config['appearance']['accent_color']};
-                width: 16px;
-                margin: -5px 0;
-                border-radius: 8px;
-            }}
-            QScrollBar:vertical {{
-                background: {theme['panel']};
-                width: 10px;
-            }}
-            QScrollBar::handle:vertical {{
-                background: {theme['button']};
-                min-height: 20px;
-            }}
-        """)
+        self.update_ui_colors()
         
         # Update config
-        if theme_name != 'custom':
+        if theme_name != 'custom' and theme_name != self.config['appearance']['theme']:
             self.config['appearance']['theme'] = theme_name
-            self.save_config()
+            self._schedule_save()
 
     def apply_accent_color(self, color_hex: str):
         """Apply accent color to the UI"""
         self.config['appearance']['accent_color'] = color_hex
-        self.save_config()
+        self._schedule_save()
         
         # Update any accent-colored elements
         self.update_ui_colors()
 
+    def apply_window_opacity(self, opacity: int):
+        """Apply window opacity (percent) and remember it"""
+        self.setWindowOpacity(opacity / 100)
+        self.config['appearance']['window_opacity'] = opacity
+        self._schedule_save()
+
     def update_ui_colors(self):
         """Update UI elements that use the accent color"""
         accent = self.config['appearance']['accent_color']
         
-        # Update slider handles
-        self.setStyleSheet(f"""
-            QSlider::handle:horizontal {{
-                background: {accent};
-            }}
-            QTabBar::tab:selected {{
-                border-bottom-color: {accent};
-            }}
-        """)
+        # Copy the cached theme palette, only the highlight depends on the accent
+        palette = QPalette(self._base_palette)
+        palette.setColor(QPalette.Highlight, _qcolor(accent))
+        QApplication.setPalette(palette)
+        
+        # Re-render the theme stylesheet rather than replacing it
+        self.setStyleSheet(self._base_qss_template.substitute(accent=accent))
 
     def init_hotkeys(self):
         """Initialize global hotkeys"""
-        # Play/Pause
-        QShortcut(QKeySequence("Space"), self, self.play_pause)
-        QShortcut(QKeySequence("Media Play"), self, self.play_pause)
-        
-        # Next/Previous
-        QShortcut(QKeySequence("Ctrl+Right"), self, self.next_track)
-        QShortcut(QKeySequence("Media Next"), self, self.next_track)
-        QShortcut(QKeySequence("Ctrl+Left"), self, self.prev_track)
-        QShortcut(QKeySequence("Media Previous"), self, self.prev_track)
-        
-        # Volume control
-        QShortcut(QKeySequence("Ctrl+Up"), self, lambda: self.set_volume(min(100, self.audio_engine.get_volume() + 5)))
-        QShortcut(QKeySequence("Ctrl+Down"), self, lambda: self.set_volume(max(0, self.audio_engine.get_volume() - 5)))
-        
-        # Mute
-        QShortcut(QKeySequence("Ctrl+M"), self, self.toggle_mute)
+        for sequence, method in _HOTKEYS:
+            QShortcut(QKeySequence(sequence), self, getattr(self, method))
+
+    def _vol_up(self):
+        """Raise volume by one step"""
+        if self.audio_engine is None:
+            return
+        self.set_volume(min(100, self.audio_engine.get_volume() + 5))
+
+    def _vol_down(self):
+        """Lower volume by one step"""
+        if self.audio_engine is None:
+            return
+        self.set_volume(max(0, self.audio_engine.get_volume() - 5))
 
     def toggle_mute(self):
         """Toggle mute state"""
+        if self.audio_engine is None:
+            return
         current = self.audio_engine.get_volume()
         if current > 0:
             self.last_volume = current
@@ -518,7 +826,7 @@ class MusicPlayer(QMainWindow):
         theme_combo = QComboBox()
         theme_combo.addItems(["dark", "light", "amethyst", "midnight", "sunset", "custom"])
         theme_combo.setCurrentText(self.config['appearance']['theme'])
-        theme_combo.currentTextChanged.connect(lambda t: self.apply_theme(t))
+        theme_combo.activated[str].connect(self.apply_theme)
         
         # Accent color
         accent_color_btn = QPushButton("Accent Color")
@@ -527,8 +835,14 @@ class MusicPlayer(QMainWindow):
         # Window opacity
         opacity_slider = QSlider(Qt.Horizontal)
         opacity_slider.setRange(30, 100)
-        opacity_slider.setValue(int(self.config['appearance']['window_opacity']))
-        opacity_slider.valueChanged.connect(lambda v: self.setWindowOpacity(v/100))
+        opacity_slider.setValue(self.config['appearance']['window_opacity'])
+        
+        # Only apply the opacity once the slider has settled
+        opacity_timer = QTimer(dialog)
+        opacity_timer.setSingleShot(True)
+        opacity_timer.setInterval(80)
+        opacity_timer.timeout.connect(lambda: self.apply_window_opacity(opacity_slider.value()))
+        opacity_slider.valueChanged.connect(lambda _: opacity_timer.start())
         
         theme_layout.addWidget(QLabel("Theme:"))
         theme_layout.addWidget(theme_combo)
@@ -556,7 +870,7 @@ class MusicPlayer(QMainWindow):
 
     def change_accent_color(self):
         """Change the accent color"""
-        color = QColorDialog.getColor(QColor(self.config['appearance']['accent_color']))
+        color = QColorDialog.getColor(_qcolor(self.config['appearance']['accent_color']))
         if color.isValid():
             self.apply_accent_color(color.name())
 